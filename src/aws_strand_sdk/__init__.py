@@ -1,6 +1,8 @@
 __all__ = [
     "AgentManager",
     "AgentConfig",
+    "AsyncAgentManager",
 ]
 
 from .agent_manager import AgentManager, AgentConfig
+from .async_agent_manager import AsyncAgentManager
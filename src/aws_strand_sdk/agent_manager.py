@@ -1,17 +1,81 @@
 from __future__ import annotations
 
+import codecs
+import functools
 import json
 import os
+import random
+import re
+import secrets
 import time
-import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Iterator
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError, EventStreamError
 
 
+# Largest maxResults accepted by ListAgents/ListAgentAliases. The summaries are
+# small, so fewer, bigger pages are cheaper than many round-trips.
+MAX_PAGE_SIZE = 1000
+
+# Shortest wait between status polls, so a zero or negative interval can't
+# turn wait_for_status into a busy loop against GetAgent.
+MIN_POLL_S = 0.05
+
+# Matches an agent ID mentioned in an error message, e.g. "agent/ABCDE12345"
+# or "agentId: ABCDE12345"; Bedrock agent IDs are 10 upper-case alphanumerics.
+_AGENT_ID_IN_MESSAGE_RE = re.compile(r"(?:agent/|(?i:agent[ _]?id)[\s:='\"]+)([0-9A-Z]{10})\b")
+
+
+def _client_token() -> str:
+    # Bedrock requires idempotency tokens of 33-256 characters
+    return secrets.token_hex(20)
+
+
+def _credential_kwargs(profile: Optional[str], access_key: Optional[str], secret_key: Optional[str]) -> Dict[str, Any]:
+    """Session arguments shared by the sync and async managers."""
+    kwargs: Dict[str, Any] = {}
+    if profile:
+        kwargs["profile_name"] = profile
+    if access_key and secret_key:
+        kwargs["aws_access_key_id"] = access_key
+        kwargs["aws_secret_access_key"] = secret_key
+    return kwargs
+
+
+def _client_config(region: str, max_pool_connections: int) -> Config:
+    # Adaptive retries back off client-side on throttling; a larger pool
+    # lets concurrent calls run in parallel instead of queueing.
+    return Config(
+        region_name=region,
+        retries={"max_attempts": 10, "mode": "adaptive"},
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=True,
+    )
+
+
+def _invoke_access_error(e: ClientError) -> Optional[RuntimeError]:
+    """Map an InvokeAgent access-denied failure to an actionable error, else None.
+
+    EventStreamError subclasses ClientError, so stream-time failures land here too.
+    """
+    code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
+    if code in {"AccessDeniedException", "accessDeniedException"}:
+        return RuntimeError(
+            "Access denied invoking agent. Ensure your caller has bedrock:InvokeAgent and (for streaming) bedrock:InvokeModelWithResponseStream permissions."
+        )
+    # Surface a cleaner message for stream-time auth/perm failures
+    msg = str(e)
+    if isinstance(e, EventStreamError) and ("accessDeniedException" in msg or "Access denied" in msg):
+        return RuntimeError(
+            "Access denied during agent streaming. Grant bedrock:InvokeAgent and bedrock:InvokeModelWithResponseStream to the invoking identity and retry."
+        )
+    return None
+
+
 @dataclass
 class AgentConfig:
     region: str
@@ -23,6 +87,35 @@ class AgentConfig:
     idle_ttl_seconds: int = 600
 
 
+class _TTLCache:
+    """Minimal dict-backed cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Any, tuple[float, Any]] = {}
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key not in self._data and len(self._data) >= self.maxsize:
+            # Drop the oldest insertion to stay bounded
+            self._data.pop(next(iter(self._data)))
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+
 class AgentManager:
     """
     Thin wrapper around Amazon Bedrock Agents (control plane + runtime).
@@ -31,52 +124,103 @@ class AgentManager:
     - Runtime client name: 'bedrock-agent-runtime'
     """
 
-    def __init__(self, region: str, profile: Optional[str] = None, *, access_key: Optional[str] = None, secret_key: Optional[str] = None):
-        session_kwargs: Dict[str, Any] = {}
-        if profile:
-            session_kwargs["profile_name"] = profile
-        if access_key and secret_key:
-            session_kwargs["aws_access_key_id"] = access_key
-            session_kwargs["aws_secret_access_key"] = secret_key
-        self._session = boto3.Session(**session_kwargs)
-        config = Config(region_name=region, retries={"max_attempts": 10, "mode": "standard"})
-        self.agents = self._session.client("bedrock-agent", config=config)
-        self.runtime = self._session.client("bedrock-agent-runtime", config=config)
+    def __init__(
+        self,
+        region: str,
+        profile: Optional[str] = None,
+        *,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        max_pool_connections: int = 50,
+    ):
+        self._session = boto3.Session(**_credential_kwargs(profile, access_key, secret_key))
+        self._config = _client_config(region, max_pool_connections)
+        self._max_pool_connections = max_pool_connections
         self.region = region
+        # Short-lived memo for name lookups; list_* stay live for the CLI
+        self._list_cache = _TTLCache(maxsize=128, ttl=60)
+        self._agent_cache = _TTLCache(maxsize=64, ttl=30)
+        self._caller_identity: Optional[Dict[str, Any]] = None
+
+    def __enter__(self) -> "AgentManager":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close any clients that were created; they are rebuilt if used again."""
+        for name in ("agents", "runtime", "_sts"):
+            client = self.__dict__.pop(name, None)
+            if client is not None:
+                client.close()
+
+    # Clients are built on first use; loading a service model is not free and
+    # most commands only need one of them.
+    @functools.cached_property
+    def agents(self) -> Any:
+        return self._session.client("bedrock-agent", config=self._config)
+
+    @functools.cached_property
+    def runtime(self) -> Any:
+        return self._session.client("bedrock-agent-runtime", config=self._config)
+
+    @functools.cached_property
+    def _sts(self) -> Any:
+        return self._session.client("sts", region_name=self.region)
 
     def get_caller_identity(self) -> Dict[str, Any]:
         """Return the AWS STS caller identity for the current session.
 
-        Useful for diagnosing which principal is used for API calls.
+        Useful for diagnosing which principal is used for API calls. The
+        identity cannot change for a session, so it is fetched only once.
         """
-        sts = self._session.client("sts", region_name=self.region)
-        return sts.get_caller_identity()
+        if self._caller_identity is None:
+            self._caller_identity = self._sts.get_caller_identity()
+        return self._caller_identity
 
     # ---------- Control plane ----------
-    def list_agents(self, max_results: int = 100) -> list[Dict[str, Any]]:
-        agents: list[Dict[str, Any]] = []
-        token: Optional[str] = None
-        while True:
-            kwargs: Dict[str, Any] = {"maxResults": max_results}
-            if token:
-                kwargs["nextToken"] = token
-            resp = self.agents.list_agents(**kwargs)
-            # Some SDKs use 'agents', others 'agentSummaries'
-            items = resp.get("agents") or resp.get("agentSummaries") or []
-            agents.extend(items)
-            token = resp.get("nextToken")
-            if not token:
-                break
-        return agents
+    def _iter_agents(self, max_results: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        """Yield agent summaries page by page, fetching the next page only when needed."""
+        paginator = self.agents.get_paginator("list_agents")
+        for page in paginator.paginate(PaginationConfig={"PageSize": min(max_results, MAX_PAGE_SIZE)}):
+            yield from page.get("agentSummaries", [])
+
+    def list_agents(self, max_results: int = MAX_PAGE_SIZE) -> list[Dict[str, Any]]:
+        return list(self._iter_agents(max_results))
+
+    def _iter_cached(self, key: tuple, items: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Serve `key` from the TTL cache, else stream `items` and cache them once fully consumed."""
+        cached = self._list_cache.get(key)
+        if cached is not None:
+            yield from cached
+            return
+        seen: list[Dict[str, Any]] = []
+        for item in items:
+            seen.append(item)
+            yield item
+        self._list_cache[key] = seen
 
     def find_agent_by_name(self, name: str) -> Optional[Dict[str, Any]]:
-        for a in self.list_agents():
-            if a.get("agentName") == name:
-                return a
-        return None
+        # A hit stops pagination early, so it is cached under its own key;
+        # the full listing is only cached when a scan runs to the end.
+        key = ("agent-name", name)
+        found = self._list_cache.get(key)
+        if found is None:
+            agents = self._iter_cached(("agents",), self._iter_agents())
+            found = next((a for a in agents if a.get("agentName") == name), None)
+            if found is not None:
+                self._list_cache[key] = found
+        return found
+
+    def get_agent(self, agent_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Return agent details, served from a 30s cache unless `use_cache` is False."""
+        agent = self._agent_cache.get(agent_id) if use_cache else None
+        if agent is None:
+            agent = self.agents.get_agent(agentId=agent_id)["agent"]
+            self._agent_cache[agent_id] = agent
+        return agent
 
-    def get_agent(self, agent_id: str) -> Dict[str, Any]:
-        return self.agents.get_agent(agentId=agent_id)["agent"]
     def create_agent(self, cfg: AgentConfig) -> Dict[str, Any]:
         try:
             resp = self.agents.create_agent(
@@ -86,12 +230,25 @@ class AgentManager:
                 description=cfg.description,
                 idleSessionTTLInSeconds=cfg.idle_ttl_seconds,
                 agentResourceRoleArn=cfg.role_arn,
-                clientToken=str(uuid.uuid4()),
+                clientToken=_client_token(),
             )
+            self._list_cache.pop(("agents",))
+            self._list_cache.pop(("agent-name", cfg.agent_name))
             return resp["agent"]
         except ClientError as e:
             error_code = getattr(e, "response", {}).get("Error", {}).get("Code")
             if error_code == "ConflictException":
+                # Prefer the ID from the error message over a full listing scan
+                message = getattr(e, "response", {}).get("Error", {}).get("Message", "")
+                match = _AGENT_ID_IN_MESSAGE_RE.search(message or "")
+                if match:
+                    # The message may mention some other resource; only trust a name match
+                    try:
+                        agent = self.get_agent(match.group(1))
+                    except ClientError:
+                        agent = {}
+                    if agent.get("agentName") == cfg.agent_name:
+                        return agent
                 existing = self.find_agent_by_name(cfg.agent_name)
                 if existing and existing.get("agentId"):
                     # Return full details
@@ -102,18 +259,38 @@ class AgentManager:
         resp = self.agents.prepare_agent(
             agentId=agent_id,
         )
+        self._agent_cache.pop(agent_id)
         return resp
 
-    def wait_for_status(self, agent_id: str, desired: str = "PREPARED", timeout_s: int = 600, poll_s: int = 10) -> str:
-        start = time.time()
-        while time.time() - start < timeout_s:
-            agent = self.agents.get_agent(agentId=agent_id)["agent"]
+    def wait_for_status(
+        self,
+        agent_id: str,
+        desired: str = "PREPARED",
+        timeout_s: int = 600,
+        poll_s: float = 10,
+        initial_poll_s: float = 0.5,
+    ) -> str:
+        """Poll the agent until it reaches `desired`.
+
+        The poll interval starts at `initial_poll_s` and doubles (with a little
+        jitter) up to `poll_s`, so fast prepares return quickly while slow ones
+        don't hammer the API. Both intervals are floored at `MIN_POLL_S`.
+        """
+        start = time.monotonic()
+        max_delay = max(poll_s, MIN_POLL_S)
+        delay = min(max(initial_poll_s, MIN_POLL_S), max_delay)
+        while time.monotonic() - start < timeout_s:
+            agent = self.get_agent(agent_id, use_cache=False)
             status = agent.get("agentStatus")
             if status == desired:
                 return status
             if status in {"FAILED", "DELETING"}:
                 raise RuntimeError(f"Agent moved to terminal state: {status}")
-            time.sleep(poll_s)
+            remaining = timeout_s - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            time.sleep(min(delay + random.uniform(0, delay * 0.1), remaining))
+            delay = min(delay * 2, max_delay)
         raise TimeoutError(f"Timed out waiting for agent {agent_id} to reach {desired}")
 
     def create_alias(self, agent_id: str, alias_name: str = "prod") -> Dict[str, Any]:
@@ -121,30 +298,46 @@ class AgentManager:
             agentId=agent_id,
             agentAliasName=alias_name,
             description=f"Alias {alias_name}",
-            clientToken=str(uuid.uuid4()),
+            clientToken=_client_token(),
         )
+        self._list_cache.pop(("aliases", agent_id))
+        self._list_cache.pop(("alias-name", agent_id, alias_name))
         return resp["agentAlias"]
 
-    def list_aliases(self, agent_id: str, max_results: int = 100) -> list[Dict[str, Any]]:
-        aliases: list[Dict[str, Any]] = []
-        token: Optional[str] = None
-        while True:
-            kwargs: Dict[str, Any] = {"agentId": agent_id, "maxResults": max_results}
-            if token:
-                kwargs["nextToken"] = token
-            resp = self.agents.list_agent_aliases(**kwargs)
-            items = resp.get("agentAliasSummaries") or resp.get("agentAliases") or []
-            aliases.extend(items)
-            token = resp.get("nextToken")
-            if not token:
-                break
-        return aliases
+    def _iter_aliases(self, agent_id: str, max_results: int = MAX_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        paginator = self.agents.get_paginator("list_agent_aliases")
+        for page in paginator.paginate(agentId=agent_id, PaginationConfig={"PageSize": min(max_results, MAX_PAGE_SIZE)}):
+            yield from page.get("agentAliasSummaries", [])
+
+    def list_aliases(self, agent_id: str, max_results: int = MAX_PAGE_SIZE) -> list[Dict[str, Any]]:
+        return list(self._iter_aliases(agent_id, max_results))
+
+    def list_aliases_bulk(self, agent_ids: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, list[Dict[str, Any]]]:
+        """Fetch aliases for many agents in parallel threads.
+
+        The calls are I/O bound, so the pool is sized well above the CPU count,
+        but never beyond the client's connection pool: extra workers would
+        only queue for a connection.
+        """
+        ids = list(agent_ids)
+        if not ids:
+            return {}
+        workers = min(max_workers or max(32, (os.cpu_count() or 1) * 5), self._max_pool_connections)
+        # Build the shared client up front so the workers don't race to create it
+        _ = self.agents
+        with ThreadPoolExecutor(max_workers=min(workers, len(ids))) as executor:
+            results = list(executor.map(self.list_aliases, ids))
+        return dict(zip(ids, results))
 
     def find_alias_by_name(self, agent_id: str, alias_name: str) -> Optional[Dict[str, Any]]:
-        for a in self.list_aliases(agent_id):
-            if a.get("agentAliasName") == alias_name:
-                return a
-        return None
+        key = ("alias-name", agent_id, alias_name)
+        found = self._list_cache.get(key)
+        if found is None:
+            aliases = self._iter_cached(("aliases", agent_id), self._iter_aliases(agent_id))
+            found = next((a for a in aliases if a.get("agentAliasName") == alias_name), None)
+            if found is not None:
+                self._list_cache[key] = found
+        return found
 
     def update_agent_role(self, agent_id: str, role_arn: str) -> Dict[str, Any]:
         """Update the agent's execution role ARN.
@@ -154,14 +347,26 @@ class AgentManager:
         resp = self.agents.update_agent(
             agentId=agent_id,
             agentResourceRoleArn=role_arn,
-            clientToken=str(uuid.uuid4()),
+            clientToken=_client_token(),
         )
+        self._list_cache.pop(("agents",))
+        self._list_cache.pop(("agent-name", resp["agent"].get("agentName")))
+        self._agent_cache.pop(agent_id)
         return resp["agent"]
 
     # ---------- Runtime ----------
     def invoke(self, agent_id: str, alias_id: str, text: str, session_id: Optional[str] = None, enable_trace: bool = False) -> str:
+        return "".join(self.invoke_stream(agent_id, alias_id, text, session_id=session_id, enable_trace=enable_trace)).strip()
+
+    def invoke_stream(self, agent_id: str, alias_id: str, text: str, session_id: Optional[str] = None, enable_trace: bool = False) -> Iterator[str]:
+        """Yield response text as it arrives from the agent's EventStream.
+
+        An incremental decoder holds back partial multi-byte characters split
+        across chunks until the rest of the character arrives.
+        """
         if not session_id:
-            session_id = str(uuid.uuid4())
+            session_id = secrets.token_hex(16)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
         try:
             resp = self.runtime.invoke_agent(
                 agentId=agent_id,
@@ -170,36 +375,24 @@ class AgentManager:
                 sessionId=session_id,
                 enableTrace=enable_trace,
             )
-            # The response is an EventStream; collect final chunk text
-            chunks = []
             for event in resp.get("completion", []):
-                if "chunk" in event:
-                    data = event["chunk"].get("bytes") or b""
-                    try:
-                        decoded = data.decode("utf-8", errors="ignore")
-                    except Exception:
-                        decoded = str(data)
-                    chunks.append(decoded)
-                elif "finalResponse" in event:
+                chunk = event.get("chunk")
+                if chunk is not None:
+                    piece = decoder.decode(chunk.get("bytes") or b"")
+                else:
                     # Some SDK versions use finalResponse.text
-                    txt = event["finalResponse"].get("text")
-                    if txt:
-                        chunks.append(txt)
-            return "".join(chunks).strip()
+                    final = event.get("finalResponse")
+                    txt = final.get("text") if final is not None else None
+                    piece = decoder.decode(txt.encode("utf-8")) if txt else ""
+                if piece:
+                    yield piece
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
         except ClientError as e:
-            code = getattr(e, "response", {}).get("Error", {}).get("Code", "")
-            if code in {"AccessDeniedException", "accessDeniedException"}:
-                raise RuntimeError(
-                    "Access denied invoking agent. Ensure your caller has bedrock:InvokeAgent and (for streaming) bedrock:InvokeModelWithResponseStream permissions."
-                ) from e
-            raise
-        except EventStreamError as e:
-            # Surface a cleaner message for stream-time auth/perm failures
-            msg = str(e)
-            if "accessDeniedException" in msg or "Access denied" in msg:
-                raise RuntimeError(
-                    "Access denied during agent streaming. Grant bedrock:InvokeAgent and bedrock:InvokeModelWithResponseStream to the invoking identity and retry."
-                ) from e
+            friendly = _invoke_access_error(e)
+            if friendly is not None:
+                raise friendly from e
             raise
 
 
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import random
+import secrets
+import time
+from typing import Optional, Dict, Any, Iterable
+
+from botocore.exceptions import ClientError
+
+from .agent_manager import MAX_PAGE_SIZE, MIN_POLL_S, _client_config, _credential_kwargs, _invoke_access_error
+
+
+class AsyncAgentManager:
+    """
+    asyncio flavour of AgentManager backed by aiobotocore.
+
+    Use as an async context manager so the underlying clients are opened and
+    closed properly:
+
+        async with AsyncAgentManager("us-east-1") as m:
+            agents = await m.list_agents()
+
+    Requires the optional 'aiobotocore' package (see requirements-async.txt).
+    """
+
+    def __init__(
+        self,
+        region: str,
+        profile: Optional[str] = None,
+        *,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        max_concurrency: int = 8,
+        max_pool_connections: int = 50,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._credentials = _credential_kwargs(profile, access_key, secret_key)
+        self._config = _client_config(region, max_pool_connections)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._session: Any = None
+        self._stack: Optional[contextlib.AsyncExitStack] = None
+        self._runtime: Any = None
+        self.region = region
+        self.agents: Any = None
+
+    async def __aenter__(self) -> "AsyncAgentManager":
+        try:
+            from aiobotocore.session import AioSession
+        except ImportError as e:
+            raise RuntimeError("AsyncAgentManager requires 'aiobotocore' (pip install -r requirements-async.txt).") from e
+        self._session = AioSession(profile=self._credentials.get("profile_name"))
+        self._stack = contextlib.AsyncExitStack()
+        self.agents = await self._stack.enter_async_context(self._create_client("bedrock-agent"))
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+        self.agents = None
+        self._runtime = None
+
+    def _create_client(self, service: str) -> Any:
+        creds = {k: v for k, v in self._credentials.items() if k != "profile_name"}
+        return self._session.create_client(service, config=self._config, **creds)
+
+    async def _runtime_client(self) -> Any:
+        # Opened on first invoke; listing-only callers never pay for it
+        if self._runtime is None:
+            self._runtime = await self._stack.enter_async_context(self._create_client("bedrock-agent-runtime"))
+        return self._runtime
+
+    # ---------- Control plane ----------
+    async def list_agents(self, max_results: int = MAX_PAGE_SIZE) -> list[Dict[str, Any]]:
+        agents: list[Dict[str, Any]] = []
+        paginator = self.agents.get_paginator("list_agents")
+        async for page in paginator.paginate(PaginationConfig={"PageSize": min(max_results, MAX_PAGE_SIZE)}):
+            agents.extend(page.get("agentSummaries", []))
+        return agents
+
+    async def list_aliases(self, agent_id: str, max_results: int = MAX_PAGE_SIZE) -> list[Dict[str, Any]]:
+        aliases: list[Dict[str, Any]] = []
+        paginator = self.agents.get_paginator("list_agent_aliases")
+        async with self._semaphore:
+            async for page in paginator.paginate(agentId=agent_id, PaginationConfig={"PageSize": min(max_results, MAX_PAGE_SIZE)}):
+                aliases.extend(page.get("agentAliasSummaries", []))
+        return aliases
+
+    async def list_aliases_bulk(self, agent_ids: Iterable[str]) -> Dict[str, list[Dict[str, Any]]]:
+        """Fetch aliases for many agents concurrently, bounded by `max_concurrency`."""
+        ids = list(agent_ids)
+        results = await asyncio.gather(*[self.list_aliases(agent_id) for agent_id in ids])
+        return dict(zip(ids, results))
+
+    async def wait_for_status(
+        self,
+        agent_id: str,
+        desired: str = "PREPARED",
+        timeout_s: int = 600,
+        poll_s: float = 10,
+        initial_poll_s: float = 0.5,
+    ) -> str:
+        start = time.monotonic()
+        max_delay = max(poll_s, MIN_POLL_S)
+        delay = min(max(initial_poll_s, MIN_POLL_S), max_delay)
+        while time.monotonic() - start < timeout_s:
+            agent = (await self.agents.get_agent(agentId=agent_id))["agent"]
+            status = agent.get("agentStatus")
+            if status == desired:
+                return status
+            if status in {"FAILED", "DELETING"}:
+                raise RuntimeError(f"Agent moved to terminal state: {status}")
+            remaining = timeout_s - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay + random.uniform(0, delay * 0.1), remaining))
+            delay = min(delay * 2, max_delay)
+        raise TimeoutError(f"Timed out waiting for agent {agent_id} to reach {desired}")
+
+    # ---------- Runtime ----------
+    async def invoke(self, agent_id: str, alias_id: str, text: str, session_id: Optional[str] = None, enable_trace: bool = False) -> str:
+        if not session_id:
+            session_id = secrets.token_hex(16)
+        runtime = await self._runtime_client()
+        try:
+            resp = await runtime.invoke_agent(
+                agentId=agent_id,
+                agentAliasId=alias_id,
+                inputText=text,
+                sessionId=session_id,
+                enableTrace=enable_trace,
+            )
+            # Collect the raw chunks and join once at the end: one allocation
+            # instead of regrowing a buffer per chunk
+            parts: list[bytes] = []
+            async for event in resp["completion"]:
+                chunk = event.get("chunk")
+                if chunk is not None:
+                    parts.append(chunk.get("bytes") or b"")
+                    continue
+                final = event.get("finalResponse")
+                if final is not None and (txt := final.get("text")):
+                    parts.append(txt.encode("utf-8"))
+            return b"".join(parts).decode("utf-8", errors="replace").strip()
+        except ClientError as e:
+            friendly = _invoke_access_error(e)
+            if friendly is not None:
+                raise friendly from e
+            raise
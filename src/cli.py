@@ -1,14 +1,46 @@
-import os
-import uuid
+import asyncio
+import functools
+import itertools
 import json
+import os
+import re
 import click
-from rich.console import Console
-from rich.table import Table
 from dotenv import load_dotenv
 
-from .aws_strand_sdk import AgentManager, AgentConfig
+from .aws_strand_sdk import AgentManager, AgentConfig, AsyncAgentManager
+
+# rich is imported on first output so `--help` and arg errors stay fast
+@functools.lru_cache(maxsize=1)
+def _console():
+    from rich.console import Console
+    return Console()
 
-console = Console()
+def _table(title: str):
+    from rich.table import Table
+    return Table(title=title)
+
+_OUTPUT_OPTION = click.option(
+    "--output",
+    type=click.Choice(["table", "json", "tsv"]),
+    default="table",
+    show_default=True,
+    help="Output format; json and tsv skip rich rendering entirely",
+)
+
+def _emit_listing(output: str, title: str, columns: list[str], rows: list[tuple[str, ...]], records: list[dict]) -> None:
+    """Print a listing as a rich table, TSV rows, or the raw records as JSON."""
+    if output == "json":
+        click.echo(json.dumps(records, default=str))
+        return
+    if output == "tsv":
+        click.echo("\n".join("\t".join(r) for r in [tuple(columns), *rows]))
+        return
+    table = _table(title)
+    for c in columns:
+        table.add_column(c)
+    for r in rows:
+        table.add_row(*r)
+    _console().print(table)
 
 def setup_env(env_file: str | None):
     if env_file and os.path.exists(env_file):
@@ -16,12 +48,36 @@ def setup_env(env_file: str | None):
     else:
         load_dotenv()
 
-def build_manager(ctx) -> AgentManager:
+def _manager_args(ctx) -> tuple[str, str | None, str | None, str | None]:
     region = ctx.obj.get("region") or os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or "us-east-1"
     profile = ctx.obj.get("profile") or os.getenv("AWS_PROFILE")
     access_key = ctx.obj.get("access_key") or os.getenv("AWS_ACCESS_KEY_ID")
     secret_key = ctx.obj.get("secret_key") or os.getenv("AWS_SECRET_ACCESS_KEY")
-    return AgentManager(region, profile, access_key=access_key, secret_key=secret_key)
+    return region, profile, access_key, secret_key
+
+def build_manager(ctx) -> AgentManager:
+    """Return the manager for this CLI invocation, creating it on first use."""
+    if ctx.obj.get("manager") is None:
+        region, profile, access_key, secret_key = _manager_args(ctx)
+        ctx.obj["manager"] = ctx.with_resource(AgentManager(region, profile, access_key=access_key, secret_key=secret_key))
+    return ctx.obj["manager"]
+
+def build_async_manager(ctx, max_concurrency: int = 8) -> AsyncAgentManager:
+    region, profile, access_key, secret_key = _manager_args(ctx)
+    return AsyncAgentManager(region, profile, access_key=access_key, secret_key=secret_key, max_concurrency=max_concurrency)
+
+_ARN_RE = re.compile(r"^arn:aws:bedrock:[^:]+:\d+:agent/(?P<agent>[^/]+)(?:/alias/(?P<alias>[^/]+))?$")
+
+def _parse_bedrock_arn(value: str) -> tuple[str | None, str | None]:
+    """Return (agent_id, alias_id) parsed from an agent or alias ARN.
+
+    Both are None when `value` is not a Bedrock agent ARN; alias_id is None
+    for a plain agent ARN.
+    """
+    match = _ARN_RE.match(value) if value else None
+    if not match:
+        return None, None
+    return match.group("agent"), match.group("alias")
 
 def _extract_alias_id(value: str) -> str:
     """Return alias ID if given an alias ID or an alias ARN.
@@ -29,12 +85,7 @@ def _extract_alias_id(value: str) -> str:
     Accepts values like 'abcd1234' or
     'arn:aws:bedrock:us-east-1:123456789012:agent/AGENTID/alias/ALIASID'.
     """
-    if value and value.startswith("arn:aws:bedrock:") and "/alias/" in value:
-        try:
-            return value.split("/alias/")[-1]
-        except Exception:
-            return value
-    return value
+    return _parse_bedrock_arn(value)[1] or value
 
 def _extract_agent_id(value: str) -> str:
     """Return agent ID if given an agent ID or an agent/alias ARN.
@@ -43,13 +94,7 @@ def _extract_agent_id(value: str) -> str:
     'arn:aws:bedrock:us-east-1:123456789012:agent/5YVSEANCUS' or
     'arn:aws:bedrock:us-east-1:123456789012:agent/5YVSEANCUS/alias/ALIASID'.
     """
-    if value and value.startswith("arn:aws:bedrock:") and "/agent/" in value:
-        try:
-            after = value.split("/agent/")[-1]
-            return after.split("/")[0]
-        except Exception:
-            return value
-    return value
+    return _parse_bedrock_arn(value)[0] or value
 
 @click.group()
 @click.option("--env-file", type=click.Path(exists=True), help="Path to .env with config values (loaded before running)")
@@ -65,39 +110,49 @@ def cli(ctx, env_file, region, profile, access_key, secret_key):
     ctx.obj["profile"] = profile
     ctx.obj["access_key"] = access_key
     ctx.obj["secret_key"] = secret_key
+    ctx.obj["manager"] = None
+    # Resolve agent settings once, after the .env file has been loaded
+    ctx.obj["env"] = {
+        "region": os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or region or "us-east-1",
+        "agent_name": os.getenv("AGENT_NAME", "strand-demo-agent"),
+        "foundation_model": os.getenv("FOUNDATION_MODEL", "anthropic.claude-3-haiku-20240307-v1:0"),
+        "instruction": os.getenv("AGENT_INSTRUCTION", "You are a helpful assistant."),
+        "role_arn": os.getenv("AGENT_ROLE_ARN", ""),
+    }
 
-@cli.command("create-agent")
-@click.option("--env-file", type=click.Path(exists=True), help="Path to .env with config values")
-@click.option("--instruction", help="Agent instruction text (min 40 chars). Overrides AGENT_INSTRUCTION env if provided.")
-@click.pass_context
-def create_agent_cmd(ctx, env_file, instruction):
-    """Create a new Bedrock Agent (control plane)."""
-    setup_env(env_file)
-    chosen_instruction = instruction or os.getenv("AGENT_INSTRUCTION", "You are a helpful assistant.")
+def _build_config(ctx, instruction: str | None) -> AgentConfig:
+    """Build the AgentConfig for create/quickstart, exiting with a hint on invalid input."""
+    env = ctx.obj["env"]
+    chosen_instruction = instruction or env["instruction"]
     if len(chosen_instruction) < 40:
-        console.print("[red]AGENT instruction must be at least 40 characters (AWS requirement).[/red]")
-        console.print("Tip: pass --instruction or set AGENT_INSTRUCTION in .env to a longer description of the agent's role.")
+        _console().print("[red]AGENT instruction must be at least 40 characters (AWS requirement).[/red]")
+        _console().print("Tip: pass --instruction or set AGENT_INSTRUCTION in .env to a longer description of the agent's role.")
         raise SystemExit(2)
-
-    cfg = AgentConfig(
-        region=os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or ctx.obj.get("region") or "us-east-1",
-        agent_name=os.getenv("AGENT_NAME", "strand-demo-agent"),
-        foundation_model=os.getenv("FOUNDATION_MODEL", "anthropic.claude-3-haiku-20240307-v1:0"),
+    if not env["role_arn"]:
+        _console().print("[red]AGENT_ROLE_ARN is required.[/red]")
+        raise SystemExit(2)
+    return AgentConfig(
+        region=env["region"],
+        agent_name=env["agent_name"],
+        foundation_model=env["foundation_model"],
         instruction=chosen_instruction,
-        role_arn=os.getenv("AGENT_ROLE_ARN", ""),
+        role_arn=env["role_arn"],
     )
-    if not cfg.role_arn:
-        console.print("[red]AGENT_ROLE_ARN is required.[/red]")
-        raise SystemExit(2)
 
+@cli.command("create-agent")
+@click.option("--instruction", help="Agent instruction text (min 40 chars). Overrides AGENT_INSTRUCTION env if provided.")
+@click.pass_context
+def create_agent_cmd(ctx, instruction):
+    """Create a new Bedrock Agent (control plane)."""
+    cfg = _build_config(ctx, instruction)
     m = build_manager(ctx)
     agent = m.create_agent(cfg)
-    table = Table(title="Agent Created")
+    table = _table("Agent Created")
     table.add_column("Key")
     table.add_column("Value")
     for k in ["agentId", "agentArn", "agentName", "agentStatus", "foundationModel"]:
         table.add_row(k, str(agent.get(k)))
-    console.print(table)
+    _console().print(table)
 
 @cli.command("prepare")
 @click.argument("agent_id")
@@ -105,10 +160,10 @@ def create_agent_cmd(ctx, env_file, instruction):
 def prepare_cmd(ctx, agent_id):
     """Prepare an agent to make it invocable."""
     m = build_manager(ctx)
-    console.print("Preparing agent...")
+    _console().print("Preparing agent...")
     m.prepare_agent(agent_id)
     status = m.wait_for_status(agent_id, "PREPARED")
-    console.print(f"Status: {status}")
+    _console().print(f"Status: {status}")
 
 @cli.command("alias")
 @click.argument("agent_id")
@@ -117,7 +172,7 @@ def prepare_cmd(ctx, agent_id):
 def alias_cmd(ctx, agent_id, name):
     m = build_manager(ctx)
     alias = m.create_alias(agent_id, name)
-    console.print(alias)
+    _console().print(alias)
 
 @cli.command("whoami")
 @click.pass_context
@@ -125,7 +180,7 @@ def whoami_cmd(ctx):
     """Show AWS caller identity, region, and profile used by this CLI."""
     m = build_manager(ctx)
     ident = m.get_caller_identity()
-    table = Table(title="AWS Caller Identity")
+    table = _table("AWS Caller Identity")
     table.add_column("Key")
     table.add_column("Value")
     table.add_row("Account", str(ident.get("Account")))
@@ -133,73 +188,85 @@ def whoami_cmd(ctx):
     table.add_row("Arn", str(ident.get("Arn")))
     table.add_row("Region", m.region)
     table.add_row("Profile", str(ctx.obj.get("profile") or os.getenv("AWS_PROFILE") or "(default)"))
-    console.print(table)
+    _console().print(table)
 
 @cli.command("quickstart")
-@click.option("--env-file", type=click.Path(exists=True), help="Path to .env with config values")
 @click.option("--alias-name", default="prod", help="Alias name")
 @click.option("--prompt", default="Say hello", help="Prompt to send after setup")
 @click.option("--instruction", help="Agent instruction text (min 40 chars). Overrides AGENT_INSTRUCTION env if provided.")
 @click.pass_context
-def quickstart_cmd(ctx, env_file, alias_name, prompt, instruction):
+def quickstart_cmd(ctx, alias_name, prompt, instruction):
     """One-shot: create -> prepare -> alias -> invoke"""
-    setup_env(env_file)
-    chosen_instruction = instruction or os.getenv("AGENT_INSTRUCTION", "You are a helpful assistant.")
-    if len(chosen_instruction) < 40:
-        console.print("[red]AGENT instruction must be at least 40 characters (AWS requirement).[/red]")
-        console.print("Tip: pass --instruction or set AGENT_INSTRUCTION in .env to a longer description of the agent's role.")
-        raise SystemExit(2)
-    cfg = AgentConfig(
-        region=os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION") or ctx.obj.get("region") or "us-east-1",
-        agent_name=os.getenv("AGENT_NAME", "strand-demo-agent"),
-        foundation_model=os.getenv("FOUNDATION_MODEL", "anthropic.claude-3-haiku-20240307-v1:0"),
-        instruction=chosen_instruction,
-        role_arn=os.getenv("AGENT_ROLE_ARN", ""),
-    )
-    if not cfg.role_arn:
-        console.print("[red]AGENT_ROLE_ARN is required.[/red]")
-        raise SystemExit(2)
+    cfg = _build_config(ctx, instruction)
 
     m = build_manager(ctx)
     agent = m.create_agent(cfg)
     agent_id = agent["agentId"]
-    console.print(f"Created agent {agent_id}, preparing...")
+    _console().print(f"Created agent {agent_id}, preparing...")
     m.prepare_agent(agent_id)
-    m.wait_for_status(agent_id, "PREPARED")
+    m.wait_for_status(agent_id, "PREPARED", initial_poll_s=0.25)
     alias = m.create_alias(agent_id, alias_name)
     alias_id = alias["agentAliasId"]
-    console.print(f"Invoking agent via alias {alias_id}...")
+    _console().print(f"Invoking agent via alias {alias_id}...")
     out = m.invoke(agent_id, alias_id, prompt)
-    console.print(out)
+    _console().print(out)
 
 @cli.command("list-agents")
+@click.option("--alias-counts/--no-alias-counts", default=False, help="Also count aliases per agent (one ListAgentAliases call per agent)")
+@click.option("--max-parallel", type=click.IntRange(min=1), default=None, help="Worker threads for alias lookups (default: max(32, 5 x CPUs), capped at the 50-connection pool)")
+@_OUTPUT_OPTION
 @click.pass_context
-def list_agents_cmd(ctx):
+def list_agents_cmd(ctx, alias_counts, max_parallel, output):
     """List Bedrock agents in the account/region."""
     m = build_manager(ctx)
     agents = m.list_agents()
-    table = Table(title="Agents")
-    table.add_column("agentId")
-    table.add_column("name")
-    table.add_column("status")
-    for a in agents:
-        table.add_row(str(a.get("agentId")), str(a.get("agentName")), str(a.get("agentStatus")))
-    console.print(table)
+    columns = ["agentId", "name", "status"]
+    rows = [(str(a.get("agentId")), str(a.get("agentName")), str(a.get("agentStatus"))) for a in agents]
+    if alias_counts:
+        aliases_by_agent = m.list_aliases_bulk([a["agentId"] for a in agents], max_workers=max_parallel)
+        counts = [len(aliases_by_agent.get(a["agentId"], [])) for a in agents]
+        columns.append("aliases")
+        rows = [(*r, str(n)) for r, n in zip(rows, counts)]
+        agents = [{**a, "aliasCount": n} for a, n in zip(agents, counts)]
+    _emit_listing(output, "Agents", columns, rows, agents)
 
 @cli.command("list-aliases")
 @click.argument("agent_id")
+@_OUTPUT_OPTION
 @click.pass_context
-def list_aliases_cmd(ctx, agent_id):
+def list_aliases_cmd(ctx, agent_id, output):
     """List aliases for a specific agent."""
     m = build_manager(ctx)
     normalized_agent_id = _extract_agent_id(agent_id)
     aliases = m.list_aliases(normalized_agent_id)
-    table = Table(title=f"Aliases for {normalized_agent_id}")
+    rows = [(str(al.get("agentAliasId")), str(al.get("agentAliasName"))) for al in aliases]
+    _emit_listing(output, f"Aliases for {normalized_agent_id}", ["aliasId", "name"], rows, aliases)
+
+@cli.command("list-all-aliases")
+@click.option("--max-concurrency", type=click.IntRange(min=1), default=8, show_default=True, help="Maximum concurrent ListAgentAliases calls")
+@click.pass_context
+def list_all_aliases_cmd(ctx, max_concurrency):
+    """List aliases for every agent, fetching them concurrently (requires aiobotocore)."""
+
+    async def _run():
+        async with build_async_manager(ctx, max_concurrency) as m:
+            agents = await m.list_agents()
+            return agents, await m.list_aliases_bulk(a["agentId"] for a in agents)
+
+    try:
+        agents, aliases_by_agent = asyncio.run(_run())
+    except RuntimeError as e:
+        _console().print(f"[red]{e}[/red]")
+        raise SystemExit(2)
+    table = _table("Aliases for all agents")
+    table.add_column("agentId")
+    table.add_column("agentName")
     table.add_column("aliasId")
-    table.add_column("name")
-    for al in aliases:
-        table.add_row(str(al.get("agentAliasId")), str(al.get("agentAliasName")))
-    console.print(table)
+    table.add_column("aliasName")
+    for a in agents:
+        for al in aliases_by_agent.get(a["agentId"], []):
+            table.add_row(str(a.get("agentId")), str(a.get("agentName")), str(al.get("agentAliasId")), str(al.get("agentAliasName")))
+    _console().print(table)
 
 @cli.command("set-role")
 @click.argument("agent_id")
@@ -209,13 +276,13 @@ def set_role_cmd(ctx, agent_id, role_arn):
     """Update the agent's execution role ARN, then advise to prepare again."""
     m = build_manager(ctx)
     agent = m.update_agent_role(agent_id, role_arn)
-    table = Table(title="Agent Updated")
+    table = _table("Agent Updated")
     table.add_column("Key")
     table.add_column("Value")
     table.add_row("agentId", str(agent.get("agentId")))
     table.add_row("agentResourceRoleArn", str(agent.get("agentResourceRoleArn")))
-    console.print(table)
-    console.print("Now run 'prepare' to propagate the new role: e.g., prepare AGENT_ID")
+    _console().print(table)
+    _console().print("Now run 'prepare' to propagate the new role: e.g., prepare AGENT_ID")
 @cli.command("invoke")
 @click.argument("agent_id")
 @click.argument("alias_id", required=False)
@@ -227,26 +294,35 @@ def set_role_cmd(ctx, agent_id, role_arn):
 @click.pass_context
 def invoke_cmd(ctx, agent_id, alias_id, alias_name, create_alias_if_missing, text, session_id, trace):
     m = build_manager(ctx)
-    # Normalize inputs (accept IDs or ARNs)
-    agent_id = _extract_agent_id(agent_id)
-    if alias_id:
+    # Normalize inputs (accept IDs or ARNs); an alias ARN passed as AGENT_ID carries both
+    parsed_agent_id, parsed_alias_id = _parse_bedrock_arn(agent_id)
+    agent_id = parsed_agent_id or agent_id
+    if not alias_id and parsed_alias_id:
+        alias_id = parsed_alias_id
+    elif alias_id:
         alias_id = _extract_alias_id(alias_id)
     else:
         try:
             found = m.find_alias_by_name(agent_id, alias_name)
         except Exception:
-            console.print("[red]Cannot list aliases. Pass alias ID/ARN directly or grant bedrock:ListAgentAliases.[/red]")
+            _console().print("[red]Cannot list aliases. Pass alias ID/ARN directly or grant bedrock:ListAgentAliases.[/red]")
             raise SystemExit(2)
         if not found:
             if create_alias_if_missing:
                 created = m.create_alias(agent_id, alias_name)
                 alias_id = created.get("agentAliasId")
-                console.print(f"Created alias '{alias_name}' with id {alias_id} for agent {agent_id}.")
+                _console().print(f"Created alias '{alias_name}' with id {alias_id} for agent {agent_id}.")
             else:
-                console.print(f"[red]Alias '{alias_name}' not found for agent {agent_id}. Use list-aliases, pass alias ID/ARN, or use --create-alias-if-missing.[/red]")
+                _console().print(f"[red]Alias '{alias_name}' not found for agent {agent_id}. Use list-aliases, pass alias ID/ARN, or use --create-alias-if-missing.[/red]")
                 raise SystemExit(2)
         else:
             alias_id = found.get("agentAliasId")
-    out = m.invoke(agent_id, alias_id, text, session_id=session_id, enable_trace=trace)
-    console.print("[bold]Response:[/bold]")
-    console.print(out)
+    pieces = m.invoke_stream(agent_id, alias_id, text, session_id=session_id, enable_trace=trace)
+    # Pull the first piece before the header so invoke errors aren't shown as a response
+    first = next(pieces, "")
+    _console().print("[bold]Response:[/bold]")
+    # Print pieces as they stream in; soft_wrap leaves wrapping to the terminal
+    # since rich would otherwise wrap each piece as if it started at column 0
+    for piece in itertools.chain([first], pieces):
+        _console().print(piece, end="", markup=False, highlight=False, soft_wrap=True)
+    _console().print()